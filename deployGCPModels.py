@@ -1,102 +1,344 @@
 import os
+import functools
+import sys
+import copy
 import json
+import random
+import re
 import yaml
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import vertexai
-from vertexai import model_garden
-from google.cloud import aiplatform
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml-backed loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+__all__ = ['VertexAIModelGardenDeployer', 'main']
+
+# Bump when the sidecar layout changes so stale caches are ignored
+_CONFIG_CACHE_VERSION = 2
+
+# Separator line for the deployment summary banner
+_SEP = "=" * 80
+# public/config.js snippet printed in the summary; formatted with outputs['api_config']
+_JS_TEMPLATE = (
+    "const VERTEX_AI_CONFIG = {{\n"
+    "  PROJECT_ID: '{project_id}',\n"
+    "  REGION: '{region}',\n"
+    "  ENDPOINT_ID: '{endpoint_id}',\n"
+    "  API_ENDPOINT: '{api_endpoint}'\n"
+    "}};"
+)
+
+# Deployment status polling backoff bounds (seconds)
+_POLL_INITIAL_SECONDS = 2
+_POLL_MAX_SECONDS = 60
+# Consecutive failed status checks before giving up on the wait
+_MAX_CONSECUTIVE_POLL_ERRORS = 5
+
+# Per-call deadline for endpoint status RPCs (seconds)
+_RPC_TIMEOUT_SECONDS = 60
+# Quantization methods accepted for container.quantization (passed to the container as QUANTIZE)
+_QUANTIZATION_METHODS = ('none', 'awq', 'gptq', 'eetq', 'bitsandbytes')
+# Upper bound on concurrent warm-up prediction threads
+_MAX_WARMUP_WORKERS = 8
+# Endpoints fetched per list page when searching for an existing deployment
+_LIST_PAGE_SIZE = 500
+
+# Machine type -> (accelerator type, accelerator count)
+_MACHINE_TO_ACCELERATOR = MappingProxyType({
+    'g2-standard-4': ('NVIDIA_L4', 1),
+    'g2-standard-8': ('NVIDIA_L4', 1),
+    'g2-standard-12': ('NVIDIA_L4', 1),
+    'g2-standard-16': ('NVIDIA_L4', 1),
+    'a2-ultragpu-1g': ('NVIDIA_A100_80GB', 1),
+    'a3-highgpu-2g': ('NVIDIA_H100_80GB', 2),
+    'n1-highmem-4': ('NVIDIA_TESLA_V100', 1),  # Default to V100 for n1-highmem-4
+})
+_DEFAULT_ACCELERATOR = ('NVIDIA_L4', 1)
+
+# Fallback for "already exists" failures not raised as AlreadyExists
+_ALREADY_EXISTS_RE = re.compile(r'already exists', re.IGNORECASE)
+
+# (section, key, environment variable, default, type) applied over the YAML config
+_ENV_OVERRIDES = (
+    # GCP settings
+    ('gcp', 'region', 'REGION', 'asia-southeast1', str),
+    ('gcp', 'api_transport', 'API_TRANSPORT', 'grpc', str),
+    # Model settings
+    ('model', 'name', 'MODEL_NAME', 'smolvlm-instruct', str),
+    ('model', 'huggingface_id', 'MODEL_ID', 'HuggingFaceTB/smolvlm-instruct', str),
+    # Deployment settings
+    ('deployment', 'machine_type', 'MACHINE_TYPE', 'g2-standard-12', str),
+    ('deployment', 'min_replica_count', 'MIN_REPLICAS', 1, int),
+    ('deployment', 'max_replica_count', 'MAX_REPLICAS', 3, int),
+    ('deployment', 'warmup_requests', 'WARMUP_REQUESTS', 0, int),
+    ('deployment', 'deploy_timeout_minutes', 'DEPLOY_TIMEOUT_MINUTES', 120, int),
+)
+
 # Configure logging
-log_level = logging.DEBUG if os.getenv('DEBUG', 'false').lower() == 'true' else logging.INFO
+log_level = logging.DEBUG if os.environ.get('DEBUG', 'false').lower() == 'true' else logging.INFO
 logging.basicConfig(
     level=log_level,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _transient_retry():
+    """Get the shared backoff policy for transient Vertex AI API errors."""
+    from google.api_core import exceptions, retry
+    
+    return retry.Retry(
+        predicate=retry.if_exception_type(
+            exceptions.ServiceUnavailable,
+            exceptions.ResourceExhausted,
+            exceptions.Aborted,
+            exceptions.DeadlineExceeded,
+        ),
+        initial=2.0,
+        maximum=30.0,
+        multiplier=2.0,
+        deadline=300.0,
+    )
+
+def _next_backoff(attempt: int, base: float = _POLL_INITIAL_SECONDS, cap: float = _POLL_MAX_SECONDS,
+                  jitter: float = 0.5) -> float:
+    """Get a truncated exponential backoff delay (seconds) with jitter for a poll attempt."""
+    return min(cap, base * 2 ** min(attempt, 32)) * (1 + random.uniform(-jitter, jitter))
+
+# (project_id, region) the Vertex AI SDK was last initialized with
+_vertex_init_key = None
+
+def _init_vertex(project_id: str, region: str):
+    """Initialize the Vertex AI SDK, skipping repeat calls for the same project and region."""
+    global _vertex_init_key
+    if _vertex_init_key != (project_id, region):
+        import vertexai
+        vertexai.init(project=project_id, location=region)
+        _vertex_init_key = (project_id, region)
+
+def _has_only_str_keys(value) -> bool:
+    """Check that every mapping key is a str, so a JSON round trip returns the same config."""
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _has_only_str_keys(v) for k, v in value.items())
+    if isinstance(value, list):
+        return all(_has_only_str_keys(v) for v in value)
+    return True
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config, reusing a JSON sidecar while the YAML is unchanged.
+    
+    Memoized on (path, mtime_ns) so deployers built in the same process share one parse.
+    """
+    cache_path = Path(f"{config_path}.cache.json")
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = json.load(f)
+        # The sidecar records the YAML mtime it was built from, so any change to
+        # the YAML (including a checkout that moves its mtime backwards) invalidates it
+        if cached.get('version') == _CONFIG_CACHE_VERSION and cached.get('yaml_mtime_ns') == mtime_ns:
+            logger.debug("Using cached configuration from %s", cache_path)
+            return cached['config']
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, AttributeError) as cache_error:
+        logger.debug("Ignoring unreadable config cache %s: %s", cache_path, cache_error)
+        
+    with open(config_path, 'rb') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+        
+    # JSON would stringify keys such as 1 or true, so a cache hit would differ from this parse
+    if not _has_only_str_keys(config):
+        logger.debug("Not caching %s: it has non-string mapping keys", config_path)
+        return config
+        
+    # Write to a temporary file and swap it in so readers never see a partial sidecar
+    tmp_path = Path(f"{cache_path}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': _CONFIG_CACHE_VERSION, 'yaml_mtime_ns': mtime_ns, 'config': config}, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as cache_error:
+        logger.debug("Could not write config cache %s: %s", cache_path, cache_error)
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        
+    return config
+
 class VertexAIModelGardenDeployer:
+    __slots__ = ('config', 'project_id', 'region', '_accelerator', '_endpoint_client', '_run_timestamp')
+    
     def __init__(self, config_path: Optional[str] = None):
         """Initialize the deployer with configuration."""
         self.config = self._load_configuration(config_path)
         self.project_id = self._get_project_id()
         self.region = self.config['gcp']['region']
+        self._accelerator = self._get_accelerator_config(self.config['deployment']['machine_type'])
+        self._endpoint_client = None
+        self._run_timestamp = None
         
         # Initialize Vertex AI
-        vertexai.init(project=self.project_id, location=self.region)
-        logger.info(f"Initialized Vertex AI for project: {self.project_id}, region: {self.region}")
+        _init_vertex(self.project_id, self.region)
+        logger.info("Initialized Vertex AI for project: %s, region: %s", self.project_id, self.region)
         
     def _load_configuration(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from environment and config files."""
         # Determine environment
-        environment = os.getenv('ENVIRONMENT', 'staging')
+        environment = os.environ.get('ENVIRONMENT', 'staging')
         
         if config_path is None:
             config_path = f".github/configs/{environment}.yml"
             
-        # Load YAML configuration
-        config = {}
-        if Path(config_path).exists():
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                logger.info(f"Loaded configuration from {config_path}")
+        # Load YAML configuration; one stat both checks existence and keys the cache
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            logger.warning("Configuration file %s not found, using defaults", config_path)
+            config = {}
         else:
-            logger.warning(f"Configuration file {config_path} not found, using defaults")
+            # Copy so the environment overrides never mutate the memoized parse
+            config = copy.deepcopy(_read_config_file(config_path, mtime_ns))
+            logger.info("Loaded configuration from %s", config_path)
             
         # Override with environment variables
         config = self._override_with_env_vars(config)
+        self._validate_configuration(config)
         return config
         
     def _override_with_env_vars(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Override configuration with environment variables."""
-        # GCP settings
-        if 'gcp' not in config:
-            config['gcp'] = {}
-        config['gcp']['region'] = os.getenv('REGION', config['gcp'].get('region', 'asia-southeast1'))
-        
-        # Model settings
-        if 'model' not in config:
-            config['model'] = {}
-        config['model']['name'] = os.getenv('MODEL_NAME', config['model'].get('name', 'smolvlm-instruct'))
-        config['model']['huggingface_id'] = os.getenv('MODEL_ID', 
-            config['model'].get('huggingface_id', 'HuggingFaceTB/smolvlm-instruct'))
-            
-        # Deployment settings
-        if 'deployment' not in config:
-            config['deployment'] = {}
-        config['deployment']['machine_type'] = os.getenv('MACHINE_TYPE', 
-            config['deployment'].get('machine_type', 'g2-standard-12'))
-        config['deployment']['min_replica_count'] = int(os.getenv('MIN_REPLICAS', 
-            config['deployment'].get('min_replica_count', 1)))
-        config['deployment']['max_replica_count'] = int(os.getenv('MAX_REPLICAS', 
-            config['deployment'].get('max_replica_count', 3)))
+        for section_name, key, env_var, default, cast in _ENV_OVERRIDES:
+            section = config.get(section_name)
+            if section is None:
+                # An empty YAML section (e.g. "model:") parses as None
+                section = config[section_name] = {}
+            value = os.environ.get(env_var)
+            if value is None:
+                value = section.get(key)
+            if value is None:
+                # A present-but-empty YAML key also parses as None
+                value = default
+            # Env values are always strings; YAML values usually already have the right type
+            if type(value) is not cast:
+                try:
+                    value = cast(value)
+                except (TypeError, ValueError):
+                    # Left as-is so _validate_configuration reports it with the other errors
+                    pass
+            section[key] = value
             
         return config
         
+    def _validate_configuration(self, config: Dict[str, Any]):
+        """Validate the merged configuration before any Vertex AI calls are made."""
+        errors = []
+        mistyped = set()
+        for section_name, key, env_var, _, cast in _ENV_OVERRIDES:
+            value = config[section_name][key]
+            if cast is str and not (isinstance(value, str) and value.strip()):
+                errors.append(f"{section_name}.{key} ({env_var}) must be a non-empty string")
+            elif cast is int and type(value) is not int:
+                errors.append(f"{section_name}.{key} ({env_var}) must be an integer, got {value!r}")
+                mistyped.add(key)
+                
+        if config['gcp']['api_transport'] not in ('grpc', 'rest'):
+            errors.append("gcp.api_transport (API_TRANSPORT) must be 'grpc' or 'rest'")
+            
+        container_config = config.get('container') or {}
+        quantization = str(container_config.get('quantization') or 'none').lower()
+        if quantization not in _QUANTIZATION_METHODS:
+            errors.append(f"container.quantization must be one of {'|'.join(_QUANTIZATION_METHODS)}, got {quantization!r}")
+            
+        # Range checks only apply to values that are already integers
+        deployment_config = config['deployment']
+        min_replicas = deployment_config['min_replica_count']
+        max_replicas = deployment_config['max_replica_count']
+        if 'min_replica_count' not in mistyped and min_replicas < 1:
+            errors.append("deployment.min_replica_count (MIN_REPLICAS) must be at least 1")
+        if not mistyped & {'min_replica_count', 'max_replica_count'} and max_replicas < min_replicas:
+            errors.append("deployment.max_replica_count (MAX_REPLICAS) must not be less than min_replica_count")
+        if 'deploy_timeout_minutes' not in mistyped and deployment_config['deploy_timeout_minutes'] < 1:
+            errors.append("deployment.deploy_timeout_minutes (DEPLOY_TIMEOUT_MINUTES) must be at least 1")
+        if 'warmup_requests' not in mistyped and deployment_config['warmup_requests'] < 0:
+            errors.append("deployment.warmup_requests (WARMUP_REQUESTS) must not be negative")
+            
+        if errors:
+            raise ValueError("Invalid configuration: " + "; ".join(errors))
+            
     def _get_project_id(self) -> str:
         """Get project ID from environment or configuration."""
-        project_id = os.getenv('PROJECT_ID')
-        if not project_id:
-            project_id = self.config.get('gcp', {}).get('project_id')
+        project_id = os.environ.get('PROJECT_ID') or self.config.get('gcp', {}).get('project_id')
         if not project_id:
             raise ValueError("PROJECT_ID must be set in environment or configuration")
         return project_id
         
     def _get_accelerator_config(self, machine_type: str) -> tuple:
         """Get the appropriate accelerator type and count based on machine type."""
-        machine_to_accelerator = {
-            'g2-standard-4': ('NVIDIA_L4', 1),
-            'g2-standard-8': ('NVIDIA_L4', 1),
-            'g2-standard-12': ('NVIDIA_L4', 1),
-            'g2-standard-16': ('NVIDIA_L4', 1),
-            'a2-ultragpu-1g': ('NVIDIA_A100_80GB', 1),
-            'a3-highgpu-2g': ('NVIDIA_H100_80GB', 2),
-            'n1-highmem-4': ('NVIDIA_TESLA_V100', 1),  # Default to V100 for n1-highmem-4
-        }
+        return _MACHINE_TO_ACCELERATOR.get(machine_type, _DEFAULT_ACCELERATOR)
+
+    def _get_serving_container_kwargs(self) -> Dict[str, Any]:
+        """Get serving container overrides for model.deploy() from the container config."""
+        container_config = self.config.get('container') or {}
+        quantization = str(container_config.get('quantization') or 'none').lower()
+        image_uri = container_config.get('image_uri')
+        if quantization != 'none':
+            image_uri = container_config.get('quantized_image_uri') or image_uri
         
-        return machine_to_accelerator.get(machine_type, ('NVIDIA_L4', 1))
+        # Model Garden only applies container settings alongside an explicit image
+        if not image_uri:
+            ignored = [
+                name for name in ('max_concurrent_requests', 'environment_variables')
+                if container_config.get(name)
+            ]
+            if quantization != 'none':
+                ignored.append(f"quantization '{quantization}'")
+            if ignored:
+                logger.warning("Ignoring container %s: no container image_uri configured", ", ".join(ignored))
+            return {}
+            
+        environment_variables = {
+            name: str(value) for name, value in (container_config.get('environment_variables') or {}).items()
+        }
+        max_concurrent_requests = container_config.get('max_concurrent_requests')
+        if max_concurrent_requests:
+            environment_variables['MAX_CONCURRENT_REQUESTS'] = str(max_concurrent_requests)
+        if quantization != 'none':
+            environment_variables['QUANTIZE'] = quantization
+            logger.info("Quantization: %s", quantization)
+            
+        logger.info("Serving container: %s", image_uri)
+        kwargs = {'serving_container_image_uri': image_uri}
+        if environment_variables:
+            kwargs['serving_container_environment_variables'] = environment_variables
+        return kwargs
+
+    def _get_endpoint_client(self):
+        """Get a regional EndpointServiceClient shared across status checks."""
+        if self._endpoint_client is None:
+            from google.cloud import aiplatform_v1
+            
+            # The generated transport keeps its own channel options (e.g. unlimited message size)
+            self._endpoint_client = aiplatform_v1.EndpointServiceClient(
+                transport=self.config['gcp']['api_transport'],
+                client_options={"api_endpoint": f"{self.region}-aiplatform.googleapis.com"}
+            )
+        return self._endpoint_client
 
     def _wait_for_deployment(self, endpoint, timeout_minutes=30):
         """Wait for endpoint deployment to complete."""
@@ -104,99 +346,102 @@ class VertexAIModelGardenDeployer:
         
         timeout_seconds = timeout_minutes * 60
         start_time = time.time()
+        attempt = 0
+        consecutive_errors = 0
         
-        logger.info(f"Waiting for deployment to complete (timeout: {timeout_minutes} minutes)...")
+        logger.info("Waiting for deployment to complete (timeout: %s minutes)...", timeout_minutes)
         
         while time.time() - start_time < timeout_seconds:
             try:
-                # For Model Garden endpoints, status checking is limited
-                # We'll try a few approaches to check deployment status
-                
-                # Method 1: Check if the endpoint has deployed models directly
-                if hasattr(endpoint, 'deployed_models') and endpoint.deployed_models:
-                    deployed_model = endpoint.deployed_models[0]
-                    if hasattr(deployed_model, 'state'):
-                        logger.info(f"Deployment state: {deployed_model.state}")
-                        
-                        if deployed_model.state == aiplatform.gapic.DeployedModel.State.DEPLOYED:
-                            logger.info("✅ Deployment completed successfully!")
-                            return True
-                        elif deployed_model.state == aiplatform.gapic.DeployedModel.State.FAILED:
-                            logger.error("❌ Deployment failed!")
-                            return False
-                    else:
-                        logger.info("📋 Deployment state not available, checking...")
-                
-                # Method 2: Try to get endpoint by resource name if available
-                elif hasattr(endpoint, 'resource_name') and endpoint.resource_name:
-                    try:
-                        from google.cloud import aiplatform_v1
-                        client = aiplatform_v1.EndpointServiceClient()
-                        fresh_endpoint = client.get_endpoint(name=endpoint.resource_name)
-                        
-                        if fresh_endpoint.deployed_models:
-                            deployed_model = fresh_endpoint.deployed_models[0]
-                            logger.info(f"Deployment state: {deployed_model.state}")
-                            
-                            if deployed_model.state == aiplatform_v1.DeployedModel.State.DEPLOYED:
-                                logger.info("✅ Deployment completed successfully!")
-                                return True
-                            elif deployed_model.state == aiplatform_v1.DeployedModel.State.FAILED:
-                                logger.error("❌ Deployment failed!")
-                                return False
-                    except Exception as client_error:
-                        logger.debug(f"Client check failed: {client_error}")
+                # model.deploy() has already blocked on the deployment LRO, and Vertex AI
+                # only attaches a DeployedModel to the endpoint once that operation has
+                # succeeded (DeployedModel itself carries no state field), so a single
+                # read of the endpoint confirms completion without further polling
+                fresh_endpoint = self._get_endpoint_client().get_endpoint(
+                    name=endpoint.resource_name,
+                    retry=_transient_retry(),
+                    timeout=_RPC_TIMEOUT_SECONDS
+                )
+                if fresh_endpoint.deployed_models:
+                    logger.info("Deployed model ID: %s", fresh_endpoint.deployed_models[0].id)
+                    logger.info("✅ Deployment completed successfully!")
+                    return True
                 
-                # Method 3: For Model Garden, if deploy() succeeded and we've waited a bit,
+                # Fallback: for Model Garden, if deploy() succeeded and we've waited a bit,
                 # assume deployment is working
                 if time.time() - start_time > 120:  # Wait at least 2 minutes
                     logger.info("💡 Model Garden deployment call succeeded and sufficient time has passed. Assuming deployment is ready.")
                     return True
                 
-                logger.info("⏳ Deployment still in progress...")
-                time.sleep(30)  # Wait 30 seconds before checking again
+                # Restart the backoff once status checks work again after an error
+                if consecutive_errors:
+                    attempt = 0
+                    consecutive_errors = 0
+                    
+                delay = _next_backoff(attempt)
+                logger.info("⏳ Deployment still in progress, checking again in %.0fs...", delay)
+                time.sleep(delay)
+                attempt += 1
                 
             except Exception as e:
-                logger.warning(f"Error checking deployment status: {str(e)}")
+                logger.warning("Error checking deployment status: %s", e)
                 # For Model Garden, if we can't check status but the deploy() call succeeded,
                 # we'll assume it's working and return success after a reasonable wait
                 if time.time() - start_time > 180:  # Wait at least 3 minutes
                     logger.info("💡 Cannot check deployment status, but deploy() call succeeded. Assuming deployment is complete.")
                     return True
-                time.sleep(30)
+                    
+                consecutive_errors += 1
+                if consecutive_errors >= _MAX_CONSECUTIVE_POLL_ERRORS:
+                    logger.error("❌ Giving up after %s consecutive failed status checks", consecutive_errors)
+                    return False
+                time.sleep(_next_backoff(attempt))
+                attempt += 1
                 
-        logger.error(f"⏰ Deployment timeout after {timeout_minutes} minutes")
+        logger.error("⏰ Deployment timeout after %s minutes", timeout_minutes)
         return False
 
     def deploy_model_garden_model(self):
         """Deploy model using Vertex AI Model Garden with improved error handling."""
+        from vertexai import model_garden
+        
         model_config = self.config['model']
         deployment_config = self.config['deployment']
         
         # Force redeploy option
-        force_redeploy = os.getenv('FORCE_REDEPLOY', 'false').lower() == 'true'
+        force_redeploy = os.environ.get('FORCE_REDEPLOY', 'false').lower() == 'true'
         
-        # Get accelerator configuration based on machine type
-        accelerator_type, accelerator_count = self._get_accelerator_config(deployment_config['machine_type'])
+        # Accelerator configuration based on machine type
+        accelerator_type, accelerator_count = self._accelerator
         
-        logger.info(f"Deploying Model Garden model: {model_config['huggingface_id']}")
-        logger.info(f"Machine type: {deployment_config['machine_type']}")
-        logger.info(f"Accelerator: {accelerator_type} x{accelerator_count}")
-        logger.info(f"Replicas: {deployment_config['min_replica_count']}-{deployment_config['max_replica_count']}")
-        logger.info(f"Force redeploy: {force_redeploy}")
+        logger.info(
+            "Deploying Model Garden model: %s\n"
+            "Machine type: %s\n"
+            "Accelerator: %s x%s\n"
+            "Replicas: %s-%s\n"
+            "Force redeploy: %s",
+            model_config['huggingface_id'],
+            deployment_config['machine_type'],
+            accelerator_type, accelerator_count,
+            deployment_config['min_replica_count'], deployment_config['max_replica_count'],
+            force_redeploy,
+        )
         
         try:
             # Create Model Garden model
             model = model_garden.OpenModel(model_config['huggingface_id'])
             
-            # Generate unique deployment names
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            # Generate unique deployment names from the run's timestamp
+            timestamp = (self._run_timestamp or datetime.now()).strftime("%Y%m%d%H%M%S")
             endpoint_name = f"{model_config['name']}-endpoint-{timestamp}"
             model_display_name = f"{model_config['name']}-{timestamp}"
             
-            logger.info("Starting model deployment...")
-            logger.info(f"Endpoint name: {endpoint_name}")
-            logger.info(f"Model display name: {model_display_name}")
+            logger.info(
+                "Starting model deployment...\n"
+                "Endpoint name: %s\n"
+                "Model display name: %s",
+                endpoint_name, model_display_name,
+            )
             
             # Deploy the model with proper error handling
             try:
@@ -209,13 +454,16 @@ class VertexAIModelGardenDeployer:
                     model_display_name=model_display_name,
                     use_dedicated_endpoint=True,
                     min_replica_count=deployment_config['min_replica_count'],
-                    max_replica_count=deployment_config['max_replica_count']
+                    max_replica_count=deployment_config['max_replica_count'],
+                    # deploy() blocks on the deployment LRO; bound that wait explicitly
+                    deploy_request_timeout=deployment_config['deploy_timeout_minutes'] * 60,
+                    **self._get_serving_container_kwargs()
                 )
                 
                 logger.info("✅ Model Garden deployment call completed successfully!")
                 
                 # Check if we should skip status checking (useful for Model Garden deployments)
-                skip_status_check = os.getenv('SKIP_STATUS_CHECK', 'false').lower() == 'true'
+                skip_status_check = os.environ.get('SKIP_STATUS_CHECK', 'false').lower() == 'true'
                 
                 if skip_status_check:
                     logger.info("💡 Skipping deployment status check (SKIP_STATUS_CHECK=true)")
@@ -230,20 +478,24 @@ class VertexAIModelGardenDeployer:
                 return model, endpoint
                 
             except Exception as deploy_error:
-                logger.error(f"❌ Model deployment failed: {str(deploy_error)}")
+                from google.api_core.exceptions import AlreadyExists
                 
-                # Enhanced error handling for common issues
-                error_msg = str(deploy_error).lower()
+                error_text = str(deploy_error)
+                logger.error("❌ Model deployment failed: %s", error_text)
                 
-                if "already exists" in error_msg:
+                # Enhanced error handling for common issues
+                if isinstance(deploy_error, AlreadyExists) or _ALREADY_EXISTS_RE.search(error_text):
                     if not force_redeploy:
                         logger.info("💡 Model/endpoint already exists. Set FORCE_REDEPLOY=true to redeploy.")
                         logger.info("Attempting to find existing endpoint...")
                         return self._find_existing_deployment(model_config)
                     else:
                         logger.info("🔄 Force redeploy enabled, but deployment still failed.")
-                        
-                elif "quota" in error_msg or "resource" in error_msg:
+                    raise deploy_error
+                
+                error_msg = error_text.lower()
+                
+                if "quota" in error_msg or "resource" in error_msg:
                     logger.error("💰 Resource quota exceeded or insufficient resources available.")
                     logger.error("💡 Try using a smaller machine type or different region.")
                     
@@ -258,94 +510,106 @@ class VertexAIModelGardenDeployer:
                 raise deploy_error
                 
         except Exception as e:
-            logger.error(f"❌ Complete deployment failed: {str(e)}")
+            logger.error("❌ Complete deployment failed: %s", e)
             raise
 
     def _find_existing_deployment(self, model_config):
         """Find existing deployment for the model."""
+        from google.cloud import aiplatform
+        
         try:
             logger.info("🔍 Searching for existing endpoints...")
             
-            # List all endpoints
-            endpoints = aiplatform.Endpoint.list()
-            
-            # Look for endpoints related to our model
+            # Page through endpoints newest first and stop at the first match;
+            # display_name filters only support exact matches server-side, so the
+            # substring match stays client-side
             model_name = model_config['name']
-            matching_endpoints = []
-            
-            for endpoint in endpoints:
-                if model_name in endpoint.display_name.lower():
-                    matching_endpoints.append(endpoint)
-                    logger.info(f"Found matching endpoint: {endpoint.display_name} ({endpoint.name})")
+            pager = self._get_endpoint_client().list_endpoints(
+                request={
+                    "parent": f"projects/{self.project_id}/locations/{self.region}",
+                    "page_size": _LIST_PAGE_SIZE,
+                    "order_by": "create_time desc",
+                },
+                retry=_transient_retry(),
+                timeout=_RPC_TIMEOUT_SECONDS
+            )
+            match = next(
+                (endpoint for endpoint in pager if model_name in endpoint.display_name.lower()),
+                None
+            )
             
-            if matching_endpoints:
-                # Use the most recent endpoint
-                latest_endpoint = matching_endpoints[-1]
-                logger.info(f"✅ Using existing endpoint: {latest_endpoint.display_name}")
+            if match is not None:
+                # Use the most recent endpoint related to our model
+                latest_endpoint = aiplatform.Endpoint(match.name)
+                logger.info("✅ Using existing endpoint: %s (%s)", latest_endpoint.display_name, latest_endpoint.name)
                 return None, latest_endpoint  # Return None for model, existing endpoint
             else:
                 logger.warning("⚠️ No existing endpoints found matching the model name")
                 raise Exception("No existing deployments found and new deployment failed")
                 
         except Exception as e:
-            logger.error(f"❌ Error finding existing deployment: {str(e)}")
+            logger.error("❌ Error finding existing deployment: %s", e)
             raise
             
-    def save_deployment_outputs(self, model, endpoint):
-        """Save deployment outputs for use in other applications."""
-        # Get endpoint details safely
+    def _extract_endpoint_id(self, endpoint) -> tuple:
+        """Get (endpoint_id, resource_name) for an endpoint, with safe fallbacks."""
+        unknown_resource_name = f"projects/{self.project_id}/locations/{self.region}/endpoints/unknown"
         try:
-            if hasattr(endpoint, 'name') and endpoint.name:
-                endpoint_id = endpoint.name.split('/')[-1]
-                endpoint_resource_name = endpoint.name
-            else:
-                # Fallback for cases where endpoint.name might not be available
-                endpoint_id = getattr(endpoint, 'resource_name', 'unknown').split('/')[-1]
-                endpoint_resource_name = getattr(endpoint, 'resource_name', f"projects/{self.project_id}/locations/{self.region}/endpoints/unknown")
+            resource_name = getattr(endpoint, 'name', None) or getattr(endpoint, 'resource_name', unknown_resource_name)
+            return resource_name.rpartition('/')[2], resource_name
         except Exception as e:
-            logger.warning(f"Could not extract endpoint ID properly: {str(e)}")
-            endpoint_id = "unknown"
-            endpoint_resource_name = f"projects/{self.project_id}/locations/{self.region}/endpoints/unknown"
+            logger.warning("Could not extract endpoint ID properly: %s", e)
+            return "unknown", unknown_resource_name
+            
+    def save_deployment_outputs(self, model, endpoint):
+        """Save deployment outputs for use in other applications."""
+        model_config = self.config['model']
+        deployment_config = self.config['deployment']
+        location_path = f"projects/{self.project_id}/locations/{self.region}"
+        endpoint_id, endpoint_resource_name = self._extract_endpoint_id(endpoint)
         
-        # Get accelerator configuration
-        accelerator_type, accelerator_count = self._get_accelerator_config(self.config['deployment']['machine_type'])
+        # Accelerator configuration
+        accelerator_type, accelerator_count = self._accelerator
         
         outputs = {
             "deployment_info": {
-                "timestamp": datetime.now().isoformat(),
-                "environment": os.getenv('ENVIRONMENT', 'staging'),
+                "timestamp": (self._run_timestamp or datetime.now()).isoformat(),
+                "environment": os.environ.get('ENVIRONMENT', 'staging'),
                 "project_id": self.project_id,
                 "region": self.region,
                 "deployment_method": "model_garden"
             },
             "model": {
-                "huggingface_id": self.config['model']['huggingface_id'],
-                "display_name": self.config['model']['name'],
+                "huggingface_id": model_config['huggingface_id'],
+                "display_name": model_config['name'],
                 "type": "model_garden_open_model"
             },
             "endpoint": {
                 "endpoint_id": endpoint_id,
-                "display_name": getattr(endpoint, 'display_name', f"{self.config['model']['name']}-endpoint"),
+                "display_name": getattr(endpoint, 'display_name', f"{model_config['name']}-endpoint"),
                 "resource_name": endpoint_resource_name
             },
             "api_config": {
                 "endpoint_id": endpoint_id,
                 "project_id": self.project_id,
                 "region": self.region,
-                "api_endpoint": f"https://{self.region}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.region}/endpoints/{endpoint_id}:predict"
+                "api_endpoint": f"https://{self.region}-aiplatform.googleapis.com/v1/{location_path}/endpoints/{endpoint_id}:predict"
             },
             "configuration": {
-                "machine_type": self.config['deployment']['machine_type'],
+                "machine_type": deployment_config['machine_type'],
                 "accelerator_type": accelerator_type,
                 "accelerator_count": accelerator_count,
-                "min_replicas": self.config['deployment']['min_replica_count'],
-                "max_replicas": self.config['deployment']['max_replica_count']
+                "min_replicas": deployment_config['min_replica_count'],
+                "max_replicas": deployment_config['max_replica_count']
             }
         }
         
-        # Save to JSON file
-        with open('deployment_outputs.json', 'w') as f:
-            json.dump(outputs, f, indent=2)
+        # Save to JSON file, serialized once and written in a single call
+        if orjson is not None:
+            payload = orjson.dumps(outputs, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(outputs, indent=2).encode('utf-8')
+        Path('deployment_outputs.json').write_bytes(payload)
             
         logger.info("Deployment outputs saved to deployment_outputs.json")
         return outputs
@@ -355,39 +619,73 @@ class VertexAIModelGardenDeployer:
         try:
             logger.info("🔍 Verifying endpoint deployment...")
             
-            # Refresh endpoint to get latest state
-            endpoint.refresh()
+            # list_models() re-reads the endpoint, so it reflects the finished deployment
+            deployed_models = _transient_retry()(endpoint.list_models)()
             
             # Check endpoint state
-            logger.info(f"Endpoint name: {endpoint.display_name}")
-            logger.info(f"Endpoint ID: {endpoint.name.split('/')[-1] if hasattr(endpoint, 'name') else 'unknown'}")
+            logger.info(
+                "Endpoint name: %s\nEndpoint ID: %s",
+                endpoint.display_name, self._extract_endpoint_id(endpoint)[0],
+            )
             
             # Check deployed models
-            if hasattr(endpoint, 'deployed_models') and endpoint.deployed_models:
-                for i, deployed_model in enumerate(endpoint.deployed_models):
-                    logger.info(f"Deployed model {i+1}:")
-                    logger.info(f"  Display name: {deployed_model.display_name}")
-                    logger.info(f"  State: {deployed_model.state}")
-                    logger.info(f"  Machine type: {deployed_model.machine_spec.machine_type}")
-                    
-                    if hasattr(deployed_model.machine_spec, 'accelerator_type'):
-                        logger.info(f"  Accelerator: {deployed_model.machine_spec.accelerator_type}")
-                        logger.info(f"  Accelerator count: {deployed_model.machine_spec.accelerator_count}")
-                        
-                return True
-            else:
+            if not deployed_models:
                 logger.warning("⚠️ No deployed models found on endpoint")
                 return False
                 
+            for i, deployed_model in enumerate(deployed_models, 1):
+                machine_spec = deployed_model.dedicated_resources.machine_spec
+                logger.info(
+                    "Deployed model %s:\n"
+                    "  ID: %s\n"
+                    "  Display name: %s\n"
+                    "  Machine type: %s\n"
+                    "  Accelerator: %s x%s",
+                    i, deployed_model.id, deployed_model.display_name,
+                    machine_spec.machine_type, machine_spec.accelerator_type.name, machine_spec.accelerator_count,
+                )
+                
+            return True
+                
         except Exception as e:
-            logger.error(f"❌ Error verifying endpoint: {str(e)}")
+            logger.error("❌ Error verifying endpoint: %s", e)
             return False
         
+    def warm_up_endpoint(self, endpoint, timeout_seconds=300):
+        """Send parallel warm-up predictions so real traffic doesn't hit a cold endpoint."""
+        deployment_config = self.config['deployment']
+        warmup_requests = deployment_config['warmup_requests']
+        if warmup_requests <= 0:
+            return 0
+            
+        instances = deployment_config.get('warmup_instances') or [{"prompt": "Hello"}]
+        logger.info("🔥 Sending %s warm-up request(s)...", warmup_requests)
+        
+        def send_warmup_request(_):
+            try:
+                endpoint.predict(instances=instances, timeout=timeout_seconds, use_dedicated_endpoint=True)
+                return True
+            except Exception as e:
+                logger.debug("Warm-up request failed: %s", e)
+                return False
+                
+        with ThreadPoolExecutor(max_workers=min(warmup_requests, _MAX_WARMUP_WORKERS)) as executor:
+            succeeded = sum(executor.map(send_warmup_request, range(warmup_requests)))
+            
+        if succeeded < warmup_requests:
+            logger.warning("⚠️ %s/%s warm-up requests failed", warmup_requests - succeeded, warmup_requests)
+        else:
+            logger.info("✅ Endpoint warm-up completed")
+        return succeeded
+        
     def deploy_complete_pipeline(self):
         """Deploy the complete pipeline using Model Garden with enhanced error handling."""
         try:
             logger.info("🚀 Starting complete Model Garden deployment pipeline...")
             
+            # One timestamp shared by deployment names and saved outputs
+            self._run_timestamp = datetime.now()
+            
             # Deploy model using Model Garden
             model, endpoint = self.deploy_model_garden_model()
             
@@ -401,11 +699,14 @@ class VertexAIModelGardenDeployer:
             # Print summary
             self._print_deployment_summary(outputs)
             
+            # Warm up the endpoint; warm_up_endpoint parallelizes the requests itself
+            self.warm_up_endpoint(endpoint)
+            
             logger.info("✅ Complete deployment pipeline finished successfully!")
             return outputs
             
         except Exception as e:
-            logger.error(f"❌ Deployment pipeline failed: {str(e)}")
+            logger.error("❌ Deployment pipeline failed: %s", e)
             logger.error("🔍 Common solutions:")
             logger.error("1. Check service account permissions (Vertex AI Admin role)")
             logger.error("2. Verify project quota for GPU resources")
@@ -415,51 +716,53 @@ class VertexAIModelGardenDeployer:
             
     def _print_deployment_summary(self, outputs: Dict[str, Any]):
         """Print a formatted deployment summary."""
-        print("\n" + "="*80)
-        print("🚀 VERTEX AI MODEL GARDEN DEPLOYMENT SUCCESSFUL!")
-        print("="*80)
-        print(f"Environment: {outputs['deployment_info']['environment']}")
-        print(f"Project: {outputs['deployment_info']['project_id']}")
-        print(f"Region: {outputs['deployment_info']['region']}")
-        print(f"Timestamp: {outputs['deployment_info']['timestamp']}")
-        print(f"Method: {outputs['deployment_info']['deployment_method']}")
-        print()
-        print("📊 Model Information:")
-        print(f"  Hugging Face ID: {outputs['model']['huggingface_id']}")
-        print(f"  Display Name: {outputs['model']['display_name']}")
-        print(f"  Type: {outputs['model']['type']}")
-        print()
-        print("🌐 Endpoint Information:")
-        print(f"  Endpoint ID: {outputs['endpoint']['endpoint_id']}")
-        print(f"  Display Name: {outputs['endpoint']['display_name']}")
-        print(f"  Resource: {outputs['endpoint']['resource_name']}")
-        print()
-        print("⚙️  Configuration:")
-        print(f"  Machine Type: {outputs['configuration']['machine_type']}")
-        print(f"  GPU: {outputs['configuration']['accelerator_type']} x{outputs['configuration']['accelerator_count']}")
-        print(f"  Replicas: {outputs['configuration']['min_replicas']}-{outputs['configuration']['max_replicas']}")
-        print()
-        print("🔧 API Configuration:")
-        print(f"  Endpoint ID: {outputs['api_config']['endpoint_id']}")
-        print(f"  Project ID: {outputs['api_config']['project_id']}")
-        print(f"  Region: {outputs['api_config']['region']}")
-        print(f"  API Endpoint: {outputs['api_config']['api_endpoint']}")
-        print()
-        print("📋 Config.js Update:")
-        print("// Update your public/config.js with these values:")
-        print(f"const VERTEX_AI_CONFIG = {{")
-        print(f"  PROJECT_ID: '{outputs['api_config']['project_id']}',")
-        print(f"  REGION: '{outputs['api_config']['region']}',")
-        print(f"  ENDPOINT_ID: '{outputs['api_config']['endpoint_id']}',")
-        print(f"  API_ENDPOINT: '{outputs['api_config']['api_endpoint']}'")
-        print(f"}};")
-        print()
-        print("📋 Next Steps:")
-        print("1. Update your application's config.js with the above values")
-        print("2. Test the endpoint with a sample prediction")
-        print("3. Monitor the deployment in the Google Cloud Console")
-        print("4. Check Vertex AI Model Garden for deployment status")
-        print("="*80)
+        # Set DEPLOYER_QUIET=true to skip building the summary entirely
+        if os.environ.get('DEPLOYER_QUIET', 'false').lower() == 'true':
+            return
+            
+        lines = [
+            "\n" + _SEP,
+            "🚀 VERTEX AI MODEL GARDEN DEPLOYMENT SUCCESSFUL!",
+            _SEP,
+            f"Environment: {outputs['deployment_info']['environment']}",
+            f"Project: {outputs['deployment_info']['project_id']}",
+            f"Region: {outputs['deployment_info']['region']}",
+            f"Timestamp: {outputs['deployment_info']['timestamp']}",
+            f"Method: {outputs['deployment_info']['deployment_method']}",
+            "",
+            "📊 Model Information:",
+            f"  Hugging Face ID: {outputs['model']['huggingface_id']}",
+            f"  Display Name: {outputs['model']['display_name']}",
+            f"  Type: {outputs['model']['type']}",
+            "",
+            "🌐 Endpoint Information:",
+            f"  Endpoint ID: {outputs['endpoint']['endpoint_id']}",
+            f"  Display Name: {outputs['endpoint']['display_name']}",
+            f"  Resource: {outputs['endpoint']['resource_name']}",
+            "",
+            "⚙️  Configuration:",
+            f"  Machine Type: {outputs['configuration']['machine_type']}",
+            f"  GPU: {outputs['configuration']['accelerator_type']} x{outputs['configuration']['accelerator_count']}",
+            f"  Replicas: {outputs['configuration']['min_replicas']}-{outputs['configuration']['max_replicas']}",
+            "",
+            "🔧 API Configuration:",
+            f"  Endpoint ID: {outputs['api_config']['endpoint_id']}",
+            f"  Project ID: {outputs['api_config']['project_id']}",
+            f"  Region: {outputs['api_config']['region']}",
+            f"  API Endpoint: {outputs['api_config']['api_endpoint']}",
+            "",
+            "📋 Config.js Update:",
+            "// Update your public/config.js with these values:",
+            _JS_TEMPLATE.format(**outputs['api_config']),
+            "",
+            "📋 Next Steps:",
+            "1. Update your application's config.js with the above values",
+            "2. Test the endpoint with a sample prediction",
+            "3. Monitor the deployment in the Google Cloud Console",
+            "4. Check Vertex AI Model Garden for deployment status",
+            _SEP,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main function to run the deployment."""
@@ -468,16 +771,18 @@ def main():
         outputs = deployer.deploy_complete_pipeline()
         
         # Set GitHub Actions output if running in CI
-        if os.getenv('GITHUB_ACTIONS'):
-            github_output = os.getenv('GITHUB_OUTPUT')
+        if os.environ.get('GITHUB_ACTIONS'):
+            github_output = os.environ.get('GITHUB_OUTPUT')
             if github_output:
                 with open(github_output, 'a') as f:
-                    f.write(f"endpoint_id={outputs['api_config']['endpoint_id']}\n")
-                    f.write(f"model_display_name={outputs['model']['display_name']}\n")
-                    f.write(f"api_endpoint={outputs['api_config']['api_endpoint']}\n")
+                    f.write(
+                        f"endpoint_id={outputs['api_config']['endpoint_id']}\n"
+                        f"model_display_name={outputs['model']['display_name']}\n"
+                        f"api_endpoint={outputs['api_config']['api_endpoint']}\n"
+                    )
                 
     except Exception as e:
-        logger.error(f"Deployment failed: {str(e)}")
+        logger.error("Deployment failed: %s", e)
         exit(1)
 
 if __name__ == "__main__":
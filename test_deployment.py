@@ -6,8 +6,14 @@ This script validates configuration and tests the deployment setup without actua
 
 import os
 import sys
+import functools
 from deployGCPModels import VertexAIModelGardenDeployer
 
+@functools.lru_cache(maxsize=8)
+def _get_deployer(config_path, environment, project_id):
+    """Get a deployer, reusing one already built for the same config, environment and project"""
+    return VertexAIModelGardenDeployer(config_path)
+
 def test_configuration():
     """Test the deployment configuration"""
     print("🧪 Testing Vertex AI Model Garden Deployment Configuration")
@@ -20,7 +26,7 @@ def test_configuration():
     
     try:
         # Initialize deployer
-        deployer = VertexAIModelGardenDeployer()
+        deployer = _get_deployer(None, os.environ['ENVIRONMENT'], os.environ['PROJECT_ID'])
         
         # Test configuration loading
         print(f"✅ Configuration loaded successfully")